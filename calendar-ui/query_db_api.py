@@ -3,37 +3,118 @@
 Query Database API
 
 Called by Next.js API route to fetch events from SQLite database.
+
+Forwards the query to query_db_daemon.py over its Unix socket when the daemon
+is running, and otherwise queries the database in-process.
+
+The JSON is spooled (in memory, spilling to a temp file when large) and copied
+to stdout only once complete, so a failure never leaves a truncated array on
+stdout.
 """
 
+import os
 import sys
 import json
-from datetime import datetime, timedelta, timezone
+import shutil
+import socket
+import tempfile
 from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional
 
-# Add parent directory to Python path to import shared_db
-sys.path.insert(0, str(Path(__file__).parent.parent))
+DB_PATH = Path(__file__).parent.parent / 'calendar.db'
+SOCKET_PATH = os.getenv('QUERY_DB_SOCKET', str(Path(__file__).parent / 'query_db.sock'))
+# Per socket operation; past this the daemon is treated as unavailable
+DAEMON_TIMEOUT = 2.0
+# Results larger than this spill from memory to a temp file before reaching stdout
+SPOOL_MAX_BYTES = 1 << 20
 
-from shared_db import CalendarDatabase
 
-DB_PATH = Path(__file__).parent.parent / 'calendar.db'
+def validate_days_ahead(days_ahead: int) -> Optional[str]:
+    """Return an error message if days_ahead is out of range, else None."""
+    if days_ahead < 0 or days_ahead > 365:
+        return 'days_ahead must be between 0 and 365'
+    return None
+
+
+def write_json_array(events: Iterable[Dict[str, Any]], write: Callable[[str], Any]) -> None:
+    """Serialize events as a JSON array one element at a time, without building the full list."""
+    write('[')
+    for i, event in enumerate(events):
+        if i:
+            write(', ')
+        write(json.dumps(event))
+    write(']')
+
+
+def query_daemon(days_ahead: int, out: BinaryIO) -> Optional[str]:
+    """Send the query to the daemon, copying its payload into out; returns the status, or None if it isn't available."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_TIMEOUT)
+            sock.connect(SOCKET_PATH)
+            sock.sendall(json.dumps({'days_ahead': days_ahead}).encode() + b'\n')
+            with sock.makefile('rb') as response:
+                status = response.readline().decode().strip()
+                if status not in ('ok', 'error'):
+                    # Closed without a status line (restarting, killed, or its handler crashed)
+                    return None
+                shutil.copyfileobj(response, out)
+            if status == 'ok':
+                # write_json_array emits the closing ']' last; without it the daemon
+                # failed mid-response
+                if not out.tell():
+                    return None
+                out.seek(-1, os.SEEK_END)
+                if out.read(1) != b']':
+                    return None
+            return status
+    except (OSError, UnicodeDecodeError):
+        # Not running, stale socket, busy/hung past DAEMON_TIMEOUT, or a garbled
+        # status line: query in-process
+        return None
+
+
+def query_in_process(days_ahead: int, out: BinaryIO) -> None:
+    """Query the database directly and stream the JSON into out (pays interpreter and SQLite startup)."""
+    # Add parent directory to Python path to import shared_db
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from shared_db import CalendarDatabase
+    
+    db = CalendarDatabase(str(DB_PATH))
+    write_json_array(db.iter_events(days_back=0, days_ahead=days_ahead), lambda text: out.write(text.encode()))
+
 
 def main():
     try:
         days_ahead = int(sys.argv[1]) if len(sys.argv) > 1 else 30
         
         # Validate input
-        if days_ahead < 0 or days_ahead > 365:
-            print(json.dumps({'error': 'days_ahead must be between 0 and 365'}), file=sys.stderr)
+        error = validate_days_ahead(days_ahead)
+        if error:
+            print(json.dumps({'error': error}), file=sys.stderr)
             sys.exit(1)
         
-        if not DB_PATH.exists():
-            print(json.dumps({'error': f'Database not found: {DB_PATH}'}), file=sys.stderr)
-            sys.exit(1)
-        
-        db = CalendarDatabase(str(DB_PATH))
-        events = db.query_events(days_back=0, days_ahead=days_ahead)
-        
-        print(json.dumps(events))
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as out:
+            status = query_daemon(days_ahead, out)
+            if status is not None and status != 'ok':
+                out.seek(0)
+                print(out.read().decode(), file=sys.stderr)
+                sys.exit(1)
+            
+            if status is None:
+                # Discard anything a daemon that failed mid-response left behind
+                out.seek(0)
+                out.truncate()
+                
+                if not DB_PATH.exists():
+                    print(json.dumps({'error': f'Database not found: {DB_PATH}'}), file=sys.stderr)
+                    sys.exit(1)
+                
+                query_in_process(days_ahead, out)
+            
+            out.seek(0)
+            shutil.copyfileobj(out, sys.stdout.buffer)
+            sys.stdout.buffer.write(b'\n')
     except ValueError as e:
         print(json.dumps({'error': f'Invalid days_ahead parameter: {e}'}), file=sys.stderr)
         sys.exit(1)
@@ -43,4 +124,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Query Database Daemon
+
+Long-running companion to query_db_api.py. Keeps one CalendarDatabase open and
+answers event queries over a Unix domain socket, so API calls skip Python
+startup and SQLite initialization.
+
+Protocol: the client sends one JSON line ({"days_ahead": 30}) and reads back a
+status line ("ok" or "error") followed by the JSON payload.
+
+Run it under launchd (macOS) or a systemd user unit to keep it alive;
+query_db_api.py falls back to querying in-process whenever the socket is absent.
+"""
+
+import os
+import sys
+import json
+import signal
+import socketserver
+from pathlib import Path
+
+# Add parent directory to Python path to import shared_db
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared_db import CalendarDatabase
+from query_db_api import DB_PATH, SOCKET_PATH, validate_days_ahead, write_json_array
+
+
+# Requests are a single short JSON line
+MAX_REQUEST_BYTES = 4096
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """Serve a single query request per connection."""
+    
+    # Requests are served one at a time, so a client that stalls (never sends its
+    # request line, or stops reading) must not hold up everyone behind it
+    timeout = 5
+    
+    def handle(self):
+        try:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+        except OSError:
+            # Stalled past the timeout or disconnected before sending a request
+            return
+        
+        try:
+            request = json.loads(line)
+            days_ahead = int(request.get('days_ahead', 30))
+        except (ValueError, TypeError, AttributeError, OverflowError) as e:
+            self._reply('error', {'error': f'Invalid days_ahead parameter: {e}'})
+            return
+        
+        error = validate_days_ahead(days_ahead)
+        if error:
+            self._reply('error', {'error': error})
+            return
+        
+        try:
+            events = self.server.db.iter_events(days_back=0, days_ahead=days_ahead)
+        except Exception as e:
+            self._reply('error', {'error': f'Database query failed: {str(e)}'})
+            return
+        
+        try:
+            self.wfile.write(b'ok\n')
+            write_json_array(events, lambda text: self.wfile.write(text.encode()))
+        except OSError:
+            # Client timed out or went away mid-response
+            pass
+    
+    def _reply(self, status: str, payload) -> None:
+        try:
+            self.wfile.write(f'{status}\n'.encode())
+            self.wfile.write(json.dumps(payload).encode())
+        except OSError:
+            # Client timed out or went away
+            pass
+
+
+class QueryServer(socketserver.UnixStreamServer):
+    """
+    Unix socket server holding a single CalendarDatabase.
+    
+    Requests are served one at a time on the main thread: CalendarDatabase keeps
+    one connection per thread, so a thread-per-request server would open a new
+    connection for every call.
+    """
+    
+    def __init__(self, socket_path: str, db: CalendarDatabase):
+        self.db = db
+        super().__init__(socket_path, QueryHandler)
+
+
+def main():
+    if not DB_PATH.exists():
+        print(json.dumps({'error': f'Database not found: {DB_PATH}'}), file=sys.stderr)
+        sys.exit(1)
+    
+    # Remove a stale socket left behind by a previous run
+    if os.path.exists(SOCKET_PATH):
+        os.unlink(SOCKET_PATH)
+    
+    # launchd/systemd stop the daemon with SIGTERM; exit through the cleanup below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    db = CalendarDatabase(str(DB_PATH))
+    server = QueryServer(SOCKET_PATH, db)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        db.close()
+        os.unlink(SOCKET_PATH)
+
+if __name__ == '__main__':
+    main()
@@ -7,71 +7,70 @@ within the same source, keeping only the first occurrence (by created_at).
 """
 
 import sqlite3
-import sys
 from pathlib import Path
-from timezone_utils import parse_iso_datetime, normalize_to_utc
+from timezone_utils import parse_iso_to_utc
 
 DB_PATH = Path(__file__).parent / 'calendar.db'
 
+# Events sharing source, subject, UTC start and organizer_email, in created_at order.
+# Every row after the first in its group is a duplicate; kept_id is the first row.
+# NULL sources are treated as 'ics' (main() rewrites them before deleting).
+DUPLICATES_QUERY = '''
+    SELECT id, subject, start_time, kept_id FROM (
+        SELECT id, subject, start_time, COALESCE(source, 'ics') AS source, created_at,
+               FIRST_VALUE(id) OVER same_event AS kept_id,
+               ROW_NUMBER() OVER same_event AS position
+        FROM appointments
+        WHERE utc_start(start_time) IS NOT NULL
+        WINDOW same_event AS (
+            PARTITION BY COALESCE(source, 'ics'), subject, utc_start(start_time), COALESCE(organizer_email, '')
+            ORDER BY created_at ASC, rowid ASC
+        )
+    )
+    WHERE position > 1
+    ORDER BY source, created_at
+'''
+
+
+def utc_start(start_time):
+    """SQL function: start_time normalized to a UTC ISO string, or NULL if unparseable."""
+    # Cached: identical start times across events are only parsed once
+    start_utc = parse_iso_to_utc(start_time)
+    return start_utc.isoformat() if start_utc else None
+
+
+def find_duplicates():
+    """
+    Scan for duplicates on a read-only connection.
+    
+    The scan parses every start time, so it is kept out of the write transaction:
+    with the database in WAL mode, syncs can keep writing while it runs.
+    """
+    with sqlite3.connect(f'{DB_PATH.resolve().as_uri()}?mode=ro', uri=True) as conn:
+        conn.create_function('utc_start', 1, utc_start, deterministic=True)
+        cursor = conn.cursor()
+        cursor.execute(DUPLICATES_QUERY)
+        return cursor.fetchall()
+
+
 def main():
+    duplicates = find_duplicates()
+    for event_id, subject, start_time, kept_id in duplicates:
+        print(f"Duplicate found: {subject} at {start_time} (keeping {kept_id}, removing {event_id})")
+    
     with sqlite3.connect(str(DB_PATH)) as conn:
         cursor = conn.cursor()
         
-        # Get all events grouped by source
-        cursor.execute('SELECT DISTINCT source FROM appointments WHERE source IS NOT NULL')
-        sources = [row[0] for row in cursor.fetchall()]
+        # Update NULL sources to 'ics' (as the duplicate scan already treated them)
+        cursor.execute('UPDATE appointments SET source = ? WHERE source IS NULL', ('ics',))
         
-        # Also handle NULL sources
-        if sources:
-            sources.append(None)
+        # Remove duplicates in the same short write transaction
+        cursor.executemany('DELETE FROM appointments WHERE id = ?', ((event_id,) for event_id, *_ in duplicates))
+        total_removed = len(duplicates)
         
-        total_removed = 0
-        
-        for source in sources:
-            if source is None:
-                # Update NULL sources to 'ics' before deduplication
-                cursor.execute('UPDATE appointments SET source = ? WHERE source IS NULL', ('ics',))
-                source = 'ics'
-            
-            # Get all events for this source
-            cursor.execute('''
-                SELECT id, subject, start_time, organizer_email, created_at 
-                FROM appointments 
-                WHERE source = ?
-                ORDER BY created_at ASC
-            ''', (source,))
-            
-            events = cursor.fetchall()
-            seen = {}
-            to_remove = []
-            
-            for event_id, subject, start_time, organizer_email, created_at in events:
-                start_dt = parse_iso_datetime(start_time)
-                if not start_dt:
-                    continue
-                
-                start_utc = normalize_to_utc(start_dt)
-                org_email = organizer_email or ''
-                
-                # Create key for deduplication
-                key = (subject, start_utc.isoformat(), org_email)
-                
-                if key in seen:
-                    # This is a duplicate
-                    to_remove.append(event_id)
-                    print(f"Duplicate found: {subject} at {start_time} (keeping {seen[key]}, removing {event_id})")
-                else:
-                    seen[key] = event_id
-            
-            # Remove duplicates
-            for event_id in to_remove:
-                cursor.execute('DELETE FROM appointments WHERE id = ?', (event_id,))
-                total_removed += 1
-            
-            conn.commit()
+        conn.commit()
         
         print(f"\nRemoved {total_removed} duplicate events")
 
 if __name__ == '__main__':
     main()
-
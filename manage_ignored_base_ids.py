@@ -39,8 +39,19 @@ def main():
     elif command == 'remove':
         if len(sys.argv) < 3:
             print("Usage: python3 manage_ignored_base_ids.py remove <base_id>")
+            print("       python3 manage_ignored_base_ids.py remove --bulk [base_id...] < ids.txt")
             sys.exit(1)
         
+        if sys.argv[2] == '--bulk':
+            # IDs from the command line plus one per line on stdin. Only read stdin when
+            # it is redirected or no IDs were given, so a terminal doesn't wait for EOF.
+            base_ids = sys.argv[3:]
+            if not base_ids or not sys.stdin.isatty():
+                base_ids += [line.strip() for line in sys.stdin if line.strip()]
+            removed = db.remove_ignored_base_ids(base_ids)
+            print(f"Removed {removed} of {len(base_ids)} IDs from ignored list")
+            return
+        
         base_id = sys.argv[2]
         db.remove_ignored_base_id(base_id)
         print(f"Removed {base_id} from ignored list")
@@ -40,8 +40,19 @@ def main():
     elif command == 'remove':
         if len(sys.argv) < 3:
             print("Usage: python3 manage_ignored_event_ids.py remove <event_id>")
+            print("       python3 manage_ignored_event_ids.py remove --bulk [event_id...] < ids.txt")
             sys.exit(1)
         
+        if sys.argv[2] == '--bulk':
+            # IDs from the command line plus one per line on stdin. Only read stdin when
+            # it is redirected or no IDs were given, so a terminal doesn't wait for EOF.
+            event_ids = sys.argv[3:]
+            if not event_ids or not sys.stdin.isatty():
+                event_ids += [line.strip() for line in sys.stdin if line.strip()]
+            removed = db.remove_ignored_event_ids(event_ids)
+            print(f"Removed {removed} of {len(event_ids)} IDs from ignored list")
+            return
+        
         event_id = sys.argv[2]
         db.remove_ignored_event_id(event_id)
         print(f"Removed {event_id} from ignored list")
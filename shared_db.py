@@ -6,17 +6,86 @@ Provides unified database operations for all calendar sync scripts.
 Eliminates code duplication and ensures consistency.
 """
 
+import re
 import sqlite3
 import logging
+import threading
+import weakref
+from contextlib import closing, contextmanager
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 import os
 
-from timezone_utils import normalize_to_utc, parse_iso_datetime
+from timezone_utils import parse_iso_to_utc
 
 logger = logging.getLogger(__name__)
 
+# Hot-path statements, kept as module constants so every call binds the same
+# SQL text and hits the connection's prepared statement cache
+# Inserts a new appointment, or overwrites an existing one with the same id
+# (keeping its created_at; base_id depends only on the id)
+_SQL_UPSERT_APPT = '''
+    INSERT INTO appointments 
+    (id, subject, start_time, end_time, location, organizer_email, 
+     organizer_name, attendees, body_preview, is_all_day, source, created_at, updated_at, base_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE
+    SET subject = excluded.subject, start_time = excluded.start_time, end_time = excluded.end_time,
+        location = excluded.location, organizer_email = excluded.organizer_email,
+        organizer_name = excluded.organizer_name, attendees = excluded.attendees,
+        body_preview = excluded.body_preview, is_all_day = excluded.is_all_day,
+        source = excluded.source, updated_at = excluded.updated_at
+'''
+
+_SQL_FIND_DUP = '''
+    SELECT id, start_time, organizer_email FROM appointments 
+    WHERE subject = ? AND source = ? 
+    AND start_time >= ? AND start_time <= ?
+'''
+
+_SQL_FIND_DUP_EX = _SQL_FIND_DUP + '''    AND id != ?
+'''
+
+_SQL_ADD_IGNORED_BASE_ID = '''
+    INSERT OR REPLACE INTO ignored_base_ids (base_id, subject, ignored_at, reason)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_ADD_IGNORED_EVENT_ID = '''
+    INSERT OR REPLACE INTO ignored_event_ids (event_id, subject, start_time, ignored_at, reason)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Suffix of recurring occurrence IDs: {base_id}_{YYYYMMDDTHHMMSS}, e.g. abc_20251201T150000
+_OCCURRENCE_SUFFIX_RE = re.compile(r'_\d{8}T\d{6}')
+_OCCURRENCE_SUFFIX_LEN = 16
+
+# (subject, start minute in UTC, organizer_email, source) -> [(start timestamp, id), ...]
+DuplicateIndex = Dict[Tuple[str, int, str, str], List[Tuple[float, str]]]
+
+# Applied once to every connection opened by CalendarDatabase
+_CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-20000',
+)
+
+
+def _close_connections(connections: List[sqlite3.Connection], lock: threading.Lock) -> None:
+    """Run PRAGMA optimize on and close every connection in the list, emptying it."""
+    with lock:
+        pending = connections[:]
+        connections.clear()
+    for conn in pending:
+        try:
+            conn.execute('PRAGMA optimize')
+        except sqlite3.Error as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+        conn.close()
+
 
 class CalendarDatabase:
     """Unified database interface for calendar events."""
@@ -24,11 +93,60 @@ class CalendarDatabase:
     def __init__(self, db_path: str):
         """Initialize database connection and schema."""
         self.db_path = db_path
+        # One long-lived connection per thread, reused by every method
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._init_database()
+        # Let SQLite refresh planner statistics before the process goes away (or this
+        # instance is garbage collected), without atexit keeping the instance alive
+        weakref.finalize(self, _close_connections, self._connections, self._connections_lock)
+    
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode: transactions are managed explicitly via _transaction()
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False, cached_statements=512)
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            # journal_mode=WAL doesn't raise when it can't switch (e.g. unsupported filesystem)
+            journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+            if journal_mode != 'wal':
+                logger.warning(f"Could not enable WAL for {self.db_path}; using journal_mode={journal_mode}")
+            conn.execute('PRAGMA optimize')
+            # Used to backfill the base_id column when migrating older databases
+            conn.create_function('event_base_id', 1, CalendarDatabase.get_base_id_from_event_id, deterministic=True)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def _transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Run a block inside BEGIN/COMMIT on this thread's connection, rolling back on error."""
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            # A failed COMMIT (e.g. SQLITE_BUSY) leaves the transaction open on this long-lived
+            # connection, and SQLite may already have rolled back (e.g. SQLITE_FULL); roll back
+            # only if needed so the original error isn't masked
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+    
+    def close(self) -> None:
+        """Close all connections opened by this instance, running PRAGMA optimize first."""
+        _close_connections(self._connections, self._connections_lock)
+        self._local = threading.local()
     
     def _init_database(self) -> None:
         """Initialize SQLite database and create tables/indexes."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # Create appointments table
@@ -46,21 +164,51 @@ class CalendarDatabase:
                     is_all_day INTEGER,
                     source TEXT,
                     created_at TEXT,
-                    updated_at TEXT
+                    updated_at TEXT,
+                    base_id TEXT,
+                    start_date TEXT GENERATED ALWAYS AS (substr(start_time, 1, 10)) VIRTUAL
                 )
             ''')
             
-            # Add source column if it doesn't exist (migration for existing databases)
-            try:
+            # Migrations for existing databases. Only issue ALTER TABLE when a column is actually
+            # missing, so opening an up-to-date database never takes the write lock.
+            # (table_xinfo, unlike table_info, also lists generated columns.)
+            cursor.execute("PRAGMA table_xinfo('appointments')")
+            columns = {row[1] for row in cursor.fetchall()}
+            
+            # Add source column if it doesn't exist
+            if 'source' not in columns:
                 cursor.execute('ALTER TABLE appointments ADD COLUMN source TEXT')
-            except sqlite3.OperationalError:
-                # Column already exists
-                pass
+            
+            # Add start_date (date prefix of start_time) so date range queries can use an index.
+            # SQLite can only add VIRTUAL generated columns to an existing table.
+            if 'start_date' not in columns:
+                cursor.execute('''
+                    ALTER TABLE appointments
+                    ADD COLUMN start_date TEXT GENERATED ALWAYS AS (substr(start_time, 1, 10)) VIRTUAL
+                ''')
+            
+            # Add base_id (series ID, see get_base_id_from_event_id) and backfill existing rows
+            if 'base_id' not in columns:
+                cursor.execute('ALTER TABLE appointments ADD COLUMN base_id TEXT')
+                cursor.execute('UPDATE appointments SET base_id = event_base_id(id)')
+            
+            # idx_start_time and idx_subject_source_time are partial indexes: rows with a NULL
+            # subject/start_time can never match the range or duplicate lookups that use them.
+            # Rebuild the full-table versions created by older databases (only once).
+            cursor.execute('''
+                SELECT name FROM sqlite_master
+                WHERE type = 'index' AND name IN ('idx_start_time', 'idx_subject_source_time')
+                AND sql NOT LIKE '%WHERE%'
+            ''')
+            for (index_name,) in cursor.fetchall():
+                cursor.execute(f'DROP INDEX {index_name}')
             
             # Create indexes for performance
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_start_time 
                 ON appointments(start_time)
+                WHERE start_time IS NOT NULL
             ''')
             
             cursor.execute('''
@@ -72,6 +220,19 @@ class CalendarDatabase:
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_subject_source_time 
                 ON appointments(subject, source, start_time)
+                WHERE subject IS NOT NULL AND start_time IS NOT NULL
+            ''')
+            
+            # Create index for start_date (used by query_events date range)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_start_date 
+                ON appointments(start_date, source)
+            ''')
+            
+            # Create index for base_id (matching events against ignored series)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_base_id 
+                ON appointments(base_id)
             ''')
             
             # Create index for end_time (used in date range queries)
@@ -101,61 +262,104 @@ class CalendarDatabase:
                 )
             ''')
             
-            conn.commit()
+            # Gather planner statistics once, the first time the database has events.
+            # ANALYZE records nothing for empty tables, so running it before then would
+            # take the write lock on every open without ever marking the job done.
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            has_stats = cursor.fetchone() is not None
+            if has_stats:
+                cursor.execute('SELECT 1 FROM sqlite_stat1 LIMIT 1')
+                has_stats = cursor.fetchone() is not None
+            if not has_stats:
+                cursor.execute('SELECT 1 FROM appointments LIMIT 1')
+                if cursor.fetchone() is not None:
+                    cursor.execute('ANALYZE')
     
     def find_duplicate(self, subject: str, start_time: str, organizer_email: str, source: str, exclude_id: Optional[str] = None) -> Optional[str]:
         """Find duplicate event by subject, start_time, and organizer_email."""
         try:
-            start_dt = parse_iso_datetime(start_time)
-            if not start_dt:
+            start_utc = parse_iso_to_utc(start_time)
+            if not start_utc:
                 return None
             
-            start_utc = normalize_to_utc(start_dt)
             # Calculate time window (1 minute before and after)
             time_window_start = (start_utc - timedelta(seconds=60)).isoformat()
             time_window_end = (start_utc + timedelta(seconds=60)).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Optimized query: filter by subject, source, and time window in SQL
-                # Then check exact time match and organizer_email in Python
-                if exclude_id:
-                    cursor.execute('''
-                        SELECT id, start_time, organizer_email FROM appointments 
-                        WHERE subject = ? AND source = ? 
-                        AND start_time >= ? AND start_time <= ?
-                        AND id != ?
-                    ''', (subject, source, time_window_start, time_window_end, exclude_id))
-                else:
-                    cursor.execute('''
-                        SELECT id, start_time, organizer_email FROM appointments 
-                        WHERE subject = ? AND source = ? 
-                        AND start_time >= ? AND start_time <= ?
-                    ''', (subject, source, time_window_start, time_window_end))
+            # Optimized query: filter by subject, source, and time window in SQL
+            # Then check exact time match and organizer_email in Python
+            if exclude_id:
+                sql, params = _SQL_FIND_DUP_EX, (subject, source, time_window_start, time_window_end, exclude_id)
+            else:
+                sql, params = _SQL_FIND_DUP, (subject, source, time_window_start, time_window_end)
+            
+            conn = self._conn
+            if conn.in_transaction:
+                # Only match committed rows, never ones written earlier in this thread's open
+                # transaction (same result as when every call opened its own connection)
+                with closing(sqlite3.connect(self.db_path)) as read_conn:
+                    rows = read_conn.execute(sql, params).fetchall()
+            else:
+                rows = conn.execute(sql, params).fetchall()
+            
+            for row_id, row_start_time, row_org_email in rows:
+                if row_id == exclude_id:
+                    continue
                 
-                for row_id, row_start_time, row_org_email in cursor.fetchall():
-                    if row_id == exclude_id:
-                        continue
-                    
-                    row_start_dt = parse_iso_datetime(row_start_time)
-                    if not row_start_dt:
-                        continue
-                    
-                    row_start_utc = normalize_to_utc(row_start_dt)
-                    
-                    # Check if times match within 1 minute
-                    time_diff = abs((start_utc - row_start_utc).total_seconds())
-                    if time_diff < 60:
-                        # Check organizer_email
-                        if (organizer_email or '') == (row_org_email or ''):
-                            return row_id
+                row_start_utc = parse_iso_to_utc(row_start_time)
+                if not row_start_utc:
+                    continue
                 
-                return None
+                # Check if times match within 1 minute
+                time_diff = abs((start_utc - row_start_utc).total_seconds())
+                if time_diff < 60:
+                    # Check organizer_email
+                    if (organizer_email or '') == (row_org_email or ''):
+                        return row_id
+            
+            return None
         except Exception as e:
             logger.warning(f"Error finding duplicate: {e}")
             return None
     
+    def _build_duplicate_index(self, cursor: sqlite3.Cursor, sources: set) -> DuplicateIndex:
+        """Load existing events for the given sources into an in-memory duplicate index."""
+        index: DuplicateIndex = {}
+        if not sources:
+            return index
+        
+        placeholders = ', '.join('?' * len(sources))
+        cursor.execute(f'''
+            SELECT id, subject, start_time, organizer_email, source FROM appointments
+            WHERE source IN ({placeholders}) AND subject IS NOT NULL
+        ''', tuple(sources))
+        
+        for row_id, subject, start_time, organizer_email, source in cursor:
+            start_utc = parse_iso_to_utc(start_time)
+            if not start_utc:
+                continue
+            timestamp = start_utc.timestamp()
+            key = (subject, int(timestamp // 60), organizer_email or '', source)
+            index.setdefault(key, []).append((timestamp, row_id))
+        return index
+    
+    @staticmethod
+    def _probe_duplicate(index: DuplicateIndex, event_id: str, subject: str, start_time: str, organizer_email: str, source: str) -> Optional[str]:
+        """In-memory equivalent of find_duplicate against a _build_duplicate_index result."""
+        start_utc = parse_iso_to_utc(start_time)
+        if not start_utc:
+            return None
+        
+        timestamp = start_utc.timestamp()
+        minute = int(timestamp // 60)
+        organizer_email = organizer_email or ''
+        # Anything within 60 seconds falls in the same or an adjacent minute bucket
+        for bucket in (minute - 1, minute, minute + 1):
+            for row_timestamp, row_id in index.get((subject, bucket, organizer_email, source), ()):
+                if row_id != event_id and abs(timestamp - row_timestamp) < 60:
+                    return row_id
+        return None
+    
     def save_appointments(self, appointments: List[Dict[str, Any]], deduplication_rules: Optional[Dict[str, Any]] = None) -> Tuple[int, int]:
         """Save appointments to database with deduplication."""
         if not appointments:
@@ -168,25 +372,47 @@ class CalendarDatabase:
         skip_same_source = deduplication_rules.get('skip_same_source', False)
         precedence = deduplication_rules.get('precedence', {})
         current_source = deduplication_rules.get('source', '')
+        now = datetime.now(timezone.utc).isoformat()
+        
+        # Extract column values once per event; source is always the last field
+        rows = [
+            (event_data['id'], (
+                event_data.get('subject', ''),
+                event_data.get('start_time', ''),
+                event_data.get('end_time', ''),
+                event_data.get('location', ''),
+                event_data.get('organizer_email', ''),
+                event_data.get('organizer_name', ''),
+                event_data.get('attendees', '[]'),
+                event_data.get('body_preview', ''),
+                event_data.get('is_all_day', 0),
+                event_data.get('source', ''),
+            ))
+            for event_data in appointments
+            if event_data and event_data.get('id')
+        ]
+        
+        # Upsert parameters, in the order the writes were decided
+        writes = []
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction(immediate=True) as conn:
             cursor = conn.cursor()
-            now = datetime.now(timezone.utc).isoformat()
             
-            for event_data in appointments:
-                if not event_data:
-                    continue
-                
-                event_id = event_data.get('id')
-                if not event_id:
-                    continue
-                
-                # Check if event already exists
-                cursor.execute('SELECT id, source FROM appointments WHERE id = ?', (event_id,))
-                existing = cursor.fetchone()
+            # Resolve which events already exist with a single join against a staged id list
+            cursor.execute('CREATE TEMP TABLE IF NOT EXISTS stage_ids (id TEXT PRIMARY KEY)')
+            cursor.execute('DELETE FROM stage_ids')
+            cursor.executemany('INSERT OR IGNORE INTO stage_ids (id) VALUES (?)', ((event_id,) for event_id, _ in rows))
+            cursor.execute('SELECT a.id, a.source FROM appointments a JOIN stage_ids s ON s.id = a.id')
+            existing = dict(cursor.fetchall())
+            
+            # Index candidate duplicates once instead of querying per new event
+            dup_index = self._build_duplicate_index(cursor, {fields[-1] for _, fields in rows})
+            
+            for event_id, fields in rows:
+                subject, start_time, _, _, organizer_email, *_, source = fields
                 
-                if existing:
-                    existing_id, existing_source = existing
+                if event_id in existing:
+                    existing_source = existing[event_id]
                     # Check precedence rules
                     if current_source and existing_source:
                         current_precedence = precedence.get(current_source, 0)
@@ -203,105 +429,44 @@ class CalendarDatabase:
                             continue
                     
                     # Update existing record
-                    cursor.execute('''
-                        UPDATE appointments
-                        SET subject = ?, start_time = ?, end_time = ?, location = ?,
-                            organizer_email = ?, organizer_name = ?, attendees = ?,
-                            body_preview = ?, is_all_day = ?, source = ?, updated_at = ?
-                        WHERE id = ?
-                    ''', (
-                        event_data.get('subject', ''),
-                        event_data.get('start_time', ''),
-                        event_data.get('end_time', ''),
-                        event_data.get('location', ''),
-                        event_data.get('organizer_email', ''),
-                        event_data.get('organizer_name', ''),
-                        event_data.get('attendees', '[]'),
-                        event_data.get('body_preview', ''),
-                        event_data.get('is_all_day', 0),
-                        event_data.get('source', ''),
-                        now,
-                        event_id
-                    ))
+                    writes.append((event_id, *fields, now, now, self.get_base_id_from_event_id(event_id)))
+                    existing[event_id] = source
                     updated_count += 1
-                else:
-                    # Check for duplicates by subject/start/organizer
-                    duplicate_id = self.find_duplicate(
-                        event_data.get('subject', ''),
-                        event_data.get('start_time', ''),
-                        event_data.get('organizer_email', ''),
-                        event_data.get('source', ''),
-                        exclude_id=event_id
-                    )
+                    continue
+                
+                # Check for duplicates by subject/start/organizer
+                duplicate_id = self._probe_duplicate(dup_index, event_id, subject, start_time, organizer_email, source)
+                
+                if duplicate_id:
+                    # find_duplicate only matches rows from the same source
+                    dup_source = existing.get(duplicate_id, source)
                     
-                    if duplicate_id:
-                        # Check precedence
-                        cursor.execute('SELECT source FROM appointments WHERE id = ?', (duplicate_id,))
-                        dup_source = cursor.fetchone()
-                        dup_source = dup_source[0] if dup_source else ''
+                    if current_source and dup_source:
+                        current_precedence = precedence.get(current_source, 0)
+                        dup_precedence = precedence.get(dup_source, 0)
                         
-                        if current_source and dup_source:
-                            current_precedence = precedence.get(current_source, 0)
-                            dup_precedence = precedence.get(dup_source, 0)
-                            
-                            if current_precedence < dup_precedence:
-                                # Lower precedence, skip
-                                continue
-                            elif current_precedence > dup_precedence:
-                                # Higher precedence, update the duplicate
-                                cursor.execute('''
-                                    UPDATE appointments
-                                    SET subject = ?, start_time = ?, end_time = ?, location = ?,
-                                        organizer_email = ?, organizer_name = ?, attendees = ?,
-                                        body_preview = ?, is_all_day = ?, source = ?, updated_at = ?
-                                    WHERE id = ?
-                                ''', (
-                                    event_data.get('subject', ''),
-                                    event_data.get('start_time', ''),
-                                    event_data.get('end_time', ''),
-                                    event_data.get('location', ''),
-                                    event_data.get('organizer_email', ''),
-                                    event_data.get('organizer_name', ''),
-                                    event_data.get('attendees', '[]'),
-                                    event_data.get('body_preview', ''),
-                                    event_data.get('is_all_day', 0),
-                                    event_data.get('source', ''),
-                                    now,
-                                    duplicate_id
-                                ))
-                                updated_count += 1
-                                continue
-                            elif skip_same_source and current_source == dup_source:
-                                # Same source, skip
-                                continue
-                        else:
-                            # No precedence rules or same precedence, skip duplicate
+                        if current_precedence < dup_precedence:
+                            # Lower precedence, skip
                             continue
-                    
-                    # Insert new record
-                    cursor.execute('''
-                        INSERT INTO appointments 
-                        (id, subject, start_time, end_time, location, organizer_email, 
-                         organizer_name, attendees, body_preview, is_all_day, source, created_at, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        event_id,
-                        event_data.get('subject', ''),
-                        event_data.get('start_time', ''),
-                        event_data.get('end_time', ''),
-                        event_data.get('location', ''),
-                        event_data.get('organizer_email', ''),
-                        event_data.get('organizer_name', ''),
-                        event_data.get('attendees', '[]'),
-                        event_data.get('body_preview', ''),
-                        event_data.get('is_all_day', 0),
-                        event_data.get('source', ''),
-                        now,
-                        now
-                    ))
-                    saved_count += 1
+                        elif current_precedence > dup_precedence:
+                            # Higher precedence, update the duplicate
+                            writes.append((duplicate_id, *fields, now, now, self.get_base_id_from_event_id(duplicate_id)))
+                            existing[duplicate_id] = source
+                            updated_count += 1
+                            continue
+                        elif skip_same_source and current_source == dup_source:
+                            # Same source, skip
+                            continue
+                    else:
+                        # No precedence rules or same precedence, skip duplicate
+                        continue
+                
+                # Insert new record
+                writes.append((event_id, *fields, now, now, self.get_base_id_from_event_id(event_id)))
+                existing[event_id] = source
+                saved_count += 1
             
-            conn.commit()
+            cursor.executemany(_SQL_UPSERT_APPT, writes)
         
         return (saved_count, updated_count)
     
@@ -311,141 +476,174 @@ class CalendarDatabase:
     
     def query_events(self, days_back: int = 0, days_ahead: int = 30, source: Optional[str] = None) -> List[Dict[str, Any]]:
         """Query events from database."""
+        return list(self.iter_events(days_back, days_ahead, source))
+    
+    def iter_events(self, days_back: int = 0, days_ahead: int = 30, source: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Query events from database, yielding them one at a time.
+        
+        The query runs immediately (so errors surface here); rows are then fetched in
+        chunks as the iterator is consumed, keeping large ranges out of memory.
+        """
         now = datetime.now(timezone.utc)
         # Use date-only strings for SQL comparison to avoid timezone offset issues
         # SQLite string comparison fails with mixed timezone offsets (e.g., -08:00 vs +00:00)
         start_date = (now - timedelta(days=days_back)).date()
         end_date = (now + timedelta(days=days_ahead)).date()
         
-        # Get ignored base IDs and specific event IDs
-        ignored_base_ids = self.get_ignored_base_ids()
-        ignored_event_ids = self.get_ignored_event_ids()
-        
         # Use date-only strings (YYYY-MM-DD) for reliable comparison
         start_date_str = start_date.isoformat()
         end_date_str = (end_date + timedelta(days=1)).isoformat()  # Include full end day
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Query using date prefix comparison (works regardless of timezone offset in stored times)
-            # This ensures we get all events that START on or after start_date and START before end_date+1
-            query = '''
-                SELECT * FROM appointments 
-                WHERE substr(start_time, 1, 10) >= ? AND substr(start_time, 1, 10) < ?
-            '''
-            params = [start_date_str, end_date_str]
-            
-            if source:
-                query += ' AND source = ?'
-                params.append(source)
-            
-            query += ' ORDER BY start_time ASC'
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            events = []
-            for row in rows:
-                # Check if event is ignored (by base ID or specific event ID)
-                event_id = row['id']
-                if event_id in ignored_event_ids:
-                    continue
-                base_id = self.get_base_id_from_event_id(event_id)
-                if base_id in ignored_base_ids:
-                    continue
-                
-                events.append({
+        cursor = self._conn.cursor()
+        # Query using date prefix comparison (works regardless of timezone offset in stored times)
+        # This ensures we get all events that START on or after start_date and START before end_date+1.
+        # start_date is the indexed generated column substr(start_time, 1, 10).
+        # Ignored events (by specific event ID or by base ID) are filtered out in SQL.
+        query = '''
+            SELECT id, subject, start_time, end_time, location, organizer_email,
+                   organizer_name, attendees, body_preview, is_all_day, source
+            FROM appointments a
+            WHERE start_date >= ? AND start_date < ?
+            AND NOT EXISTS (SELECT 1 FROM ignored_event_ids WHERE event_id = a.id)
+            AND NOT EXISTS (SELECT 1 FROM ignored_base_ids i WHERE i.base_id = a.base_id)
+        '''
+        params = [start_date_str, end_date_str]
+        
+        if source:
+            query += ' AND source = ?'
+            params.append(source)
+        
+        query += ' ORDER BY start_time ASC'
+        
+        cursor.execute(query, params)
+        return self._iter_event_rows(cursor)
+    
+    @staticmethod
+    def _iter_event_rows(cursor: sqlite3.Cursor, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Turn query_events rows into event dicts, fetching chunk_size rows at a time."""
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for (event_id, subject, start_time, end_time, location, organizer_email,
+                 organizer_name, attendees, body_preview, is_all_day, event_source) in rows:
+                yield {
                     'id': event_id,
-                    'subject': row['subject'],
-                    'start_time': row['start_time'],
-                    'end_time': row['end_time'],
-                    'location': row['location'] or '',
-                    'organizer_email': row['organizer_email'] or '',
-                    'organizer_name': row['organizer_name'] or '',
-                    'attendees': row['attendees'] or '[]',
-                    'body_preview': row['body_preview'] or '',
-                    'is_all_day': row['is_all_day'],
-                    'source': row['source'] or ''
-                })
-            
-            return events
+                    'subject': subject,
+                    'start_time': start_time,
+                    'end_time': end_time,
+                    'location': location or '',
+                    'organizer_email': organizer_email or '',
+                    'organizer_name': organizer_name or '',
+                    'attendees': attendees or '[]',
+                    'body_preview': body_preview or '',
+                    'is_all_day': is_all_day,
+                    'source': event_source or ''
+                }
+    
+    def _load_ignored(self) -> Tuple[set, set]:
+        """
+        Return (ignored base IDs, ignored event IDs), cached per connection.
+        
+        Both tables are read in a single query. The cache is reloaded when PRAGMA
+        data_version changes (another connection or process committed) and cleared
+        by this instance's own add/remove methods.
+        """
+        conn = self._conn
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        cached = getattr(self._local, 'ignored_cache', None)
+        if cached is None or cached[0] != data_version:
+            base_ids = set()
+            event_ids = set()
+            cursor = conn.execute('''
+                SELECT 'b', base_id FROM ignored_base_ids
+                UNION ALL
+                SELECT 'e', event_id FROM ignored_event_ids
+            ''')
+            for kind, ignored_id in cursor:
+                (base_ids if kind == 'b' else event_ids).add(ignored_id)
+            cached = self._local.ignored_cache = (data_version, base_ids, event_ids)
+        return cached[1], cached[2]
+    
+    def _invalidate_ignored_cache(self) -> None:
+        """Drop this thread's cached ignored ID sets after a local write."""
+        self._local.ignored_cache = None
     
     def get_ignored_base_ids(self) -> set:
         """Get set of ignored base IDs."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT base_id FROM ignored_base_ids')
-            return {row[0] for row in cursor.fetchall()}
+        return set(self._load_ignored()[0])
     
     def get_ignored_base_ids_list(self) -> List[Dict[str, Any]]:
         """Get list of ignored base IDs with details."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT base_id, subject, ignored_at FROM ignored_base_ids ORDER BY ignored_at DESC')
-            return [dict(row) for row in cursor.fetchall()]
+        cursor = self._conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('SELECT base_id, subject, ignored_at FROM ignored_base_ids ORDER BY ignored_at DESC')
+        return [dict(row) for row in cursor.fetchall()]
     
     def add_ignored_base_id(self, base_id: str, subject: str, reason: str = 'User ignored') -> None:
         """Add a base ID to the ignored list."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             now = datetime.now(timezone.utc).isoformat()
-            cursor.execute('''
-                INSERT OR REPLACE INTO ignored_base_ids (base_id, subject, ignored_at, reason)
-                VALUES (?, ?, ?, ?)
-            ''', (base_id, subject, now, reason))
-            conn.commit()
+            cursor.execute(_SQL_ADD_IGNORED_BASE_ID, (base_id, subject, now, reason))
+        self._invalidate_ignored_cache()
     
     def remove_ignored_base_id(self, base_id: str) -> None:
         """Remove a base ID from the ignored list."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM ignored_base_ids WHERE base_id = ?', (base_id,))
-            conn.commit()
+        self._invalidate_ignored_cache()
+    
+    def remove_ignored_base_ids(self, base_ids: Iterable[str]) -> int:
+        """Remove several base IDs from the ignored list in one transaction; returns the number removed."""
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM ignored_base_ids WHERE base_id = ?', ((base_id,) for base_id in base_ids))
+            removed = cursor.rowcount
+        self._invalidate_ignored_cache()
+        return removed
     
     def get_ignored_event_ids(self) -> set:
         """Get set of ignored specific event IDs."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT event_id FROM ignored_event_ids')
-            return {row[0] for row in cursor.fetchall()}
+        return set(self._load_ignored()[1])
     
     def get_ignored_event_ids_list(self) -> List[Dict[str, Any]]:
         """Get list of ignored specific event IDs with details."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT event_id, subject, start_time, ignored_at FROM ignored_event_ids ORDER BY ignored_at DESC')
-            return [dict(row) for row in cursor.fetchall()]
+        cursor = self._conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('SELECT event_id, subject, start_time, ignored_at FROM ignored_event_ids ORDER BY ignored_at DESC')
+        return [dict(row) for row in cursor.fetchall()]
     
     def add_ignored_event_id(self, event_id: str, subject: str, start_time: str, reason: str = 'User ignored') -> None:
         """Add a specific event ID to the ignored list."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             now = datetime.now(timezone.utc).isoformat()
-            cursor.execute('''
-                INSERT OR REPLACE INTO ignored_event_ids (event_id, subject, start_time, ignored_at, reason)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (event_id, subject, start_time, now, reason))
-            conn.commit()
+            cursor.execute(_SQL_ADD_IGNORED_EVENT_ID, (event_id, subject, start_time, now, reason))
+        self._invalidate_ignored_cache()
     
     def remove_ignored_event_id(self, event_id: str) -> None:
         """Remove a specific event ID from the ignored list."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM ignored_event_ids WHERE event_id = ?', (event_id,))
-            conn.commit()
+        self._invalidate_ignored_cache()
+    
+    def remove_ignored_event_ids(self, event_ids: Iterable[str]) -> int:
+        """Remove several specific event IDs from the ignored list in one transaction; returns the number removed."""
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM ignored_event_ids WHERE event_id = ?', ((event_id,) for event_id in event_ids))
+            removed = cursor.rowcount
+        self._invalidate_ignored_cache()
+        return removed
     
-    def get_base_id_from_event_id(self, event_id: str) -> str:
+    @staticmethod
+    def get_base_id_from_event_id(event_id: str) -> str:
         """Extract base ID from event ID (handles {base_id}_{timestamp} format)."""
-        if '_' in event_id:
-            parts = event_id.split('_')
-            if len(parts) >= 2:
-                last_part = parts[-1]
-                # Check if last part is a timestamp (YYYYMMDDTHHMMSS format, e.g., 20251201T150000)
-                # Format: 8 digits + 'T' + 6 digits = 15 chars total
-                if len(last_part) == 15 and last_part[8] == 'T' and last_part[:8].isdigit() and last_part[9:].isdigit():
-                    return '_'.join(parts[:-1])
+        # The timestamp suffix has a fixed length, so only the tail of the ID is matched
+        if '_' in event_id and _OCCURRENCE_SUFFIX_RE.fullmatch(event_id, len(event_id) - _OCCURRENCE_SUFFIX_LEN):
+            return event_id[:-_OCCURRENCE_SUFFIX_LEN]
         return event_id
@@ -5,14 +5,16 @@ Unified Timezone Handling Utilities
 Provides consistent timezone conversion and parsing across all sync scripts.
 """
 
+import sys
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache, partial
 from typing import Optional
 
-try:
+if sys.version_info >= (3, 9):
     from zoneinfo import ZoneInfo
     _pytz = None  # Not needed
-except ImportError:
-    # Fallback for Python < 3.9
+else:
+    # Fallback for Python < 3.9; only probed where zoneinfo can't exist
     try:
         from backports.zoneinfo import ZoneInfo
         _pytz = None  # Not needed
@@ -23,6 +25,42 @@ except ImportError:
         except ImportError:
             _pytz = None
 
+_UTC = timezone.utc
+_now_utc = partial(datetime.now, _UTC)
+
+# fromisoformat accepts a trailing 'Z' natively from Python 3.11 on
+_FROMISO_HANDLES_Z = sys.version_info >= (3, 11)
+_fromisoformat = datetime.fromisoformat
+
+# ciso8601 is optional; when installed it parses faster and always accepts 'Z'
+try:
+    from ciso8601 import parse_datetime as _parse_impl
+    _PARSE_HANDLES_Z = True
+except ImportError:
+    _parse_impl = _fromisoformat
+    _PARSE_HANDLES_Z = _FROMISO_HANDLES_Z
+
+# Resolved once at import; normalize_to_pacific runs per event during syncs
+_PACIFIC_TZ = None
+if ZoneInfo:
+    try:
+        _PACIFIC_TZ = ZoneInfo('America/Los_Angeles')
+    except KeyError:
+        # ZoneInfoNotFoundError: no system tz database and no tzdata package
+        # (e.g. Windows, slim containers); fall back to pytz's bundled zones
+        try:
+            import pytz as _pytz
+        except ImportError:
+            _pytz = None
+_PYTZ_PACIFIC = _pytz.timezone('America/Los_Angeles') if _pytz else None
+_FIXED_PST = timezone(timedelta(hours=-8))
+
+# compare_datetimes tolerances, keyed by seconds (callers use a few constants)
+_TOLERANCE_DELTAS = {}
+
+# get_date_range windows, keyed by days (sync scripts use fixed windows)
+_TD_DAYS = {}
+
 
 def normalize_to_utc(dt: datetime) -> datetime:
     """
@@ -34,9 +72,13 @@ def normalize_to_utc(dt: datetime) -> datetime:
     Returns:
         Timezone-aware datetime in UTC
     """
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+    tz = dt.tzinfo
+    # Already-normalized datetimes are the common case in comparison loops
+    if tz is _UTC:
+        return dt
+    if tz is None:
+        return dt.replace(tzinfo=_UTC)
+    return dt.astimezone(_UTC)
 
 
 def parse_iso_datetime(iso_str: str) -> Optional[datetime]:
@@ -49,30 +91,67 @@ def parse_iso_datetime(iso_str: str) -> Optional[datetime]:
     - '2025-12-01T15:00:00-08:00' (PST)
     - '2025-12-01T15:00:00' (naive - assumes UTC)
     
+    Results are memoized; ICS feeds repeat the same timestamps across
+    recurring events and every sync pass.
+    
     Args:
         iso_str: ISO8601 formatted datetime string
     
     Returns:
         Timezone-aware datetime, or None if parsing fails
     """
-    if not iso_str:
+    # Checked before the cache, which would raise TypeError on unhashable input
+    if not iso_str or not isinstance(iso_str, str):
         return None
-    
+    return _parse_iso_cached(iso_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_cached(iso_str: str) -> Optional[datetime]:
+    """Memoized body of parse_iso_datetime; iso_str is a non-empty string."""
     try:
-        # Handle 'Z' suffix (UTC indicator)
-        if iso_str.endswith('Z'):
-            iso_str = iso_str.replace('Z', '+00:00')
+        # Handle 'Z' suffix (UTC indicator) when the parser can't
+        if not _PARSE_HANDLES_Z and iso_str.endswith('Z'):
+            iso_str = iso_str[:-1] + '+00:00'
         
         # Parse ISO8601 string
-        dt = datetime.fromisoformat(iso_str)
+        dt = _parse_impl(iso_str)
         
         # Ensure timezone-aware (assume UTC if naive)
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
+            dt = dt.replace(tzinfo=_UTC)
         
         return dt
-    except (ValueError, AttributeError) as e:
+    except ValueError:
+        return None
+
+
+def parse_iso_to_utc(iso_str: str) -> Optional[datetime]:
+    """
+    Parse ISO8601 string and normalize it to UTC, memoizing the result.
+    
+    Sync and cleanup loops see the same start times over and over (recurring
+    events, repeated syncs), so identical strings are only parsed once.
+    
+    Args:
+        iso_str: ISO8601 formatted datetime string
+    
+    Returns:
+        Timezone-aware datetime in UTC, or None if parsing fails
+    """
+    # Checked before the cache, which would raise TypeError on unhashable input
+    if not iso_str or not isinstance(iso_str, str):
         return None
+    return _parse_iso_to_utc_cached(iso_str)
+
+
+@lru_cache(maxsize=65536)
+def _parse_iso_to_utc_cached(iso_str: str) -> Optional[datetime]:
+    """Memoized body of parse_iso_to_utc; iso_str is a non-empty string."""
+    dt = _parse_iso_cached(iso_str)
+    if dt is None:
+        return None
+    return normalize_to_utc(dt)
 
 
 def format_iso_datetime(dt: datetime, preserve_timezone: bool = False) -> str:
@@ -89,9 +168,13 @@ def format_iso_datetime(dt: datetime, preserve_timezone: bool = False) -> str:
     if preserve_timezone:
         return dt.isoformat()
     else:
-        # Convert to UTC and format
-        utc_dt = normalize_to_utc(dt)
-        return utc_dt.isoformat()
+        # Convert to UTC and format (normalize_to_utc inlined)
+        tz = dt.tzinfo
+        if tz is _UTC:
+            return dt.isoformat()
+        if tz is None:
+            return dt.replace(tzinfo=_UTC).isoformat()
+        return dt.astimezone(_UTC).isoformat()
 
 
 def compare_datetimes(dt1: datetime, dt2: datetime, tolerance_seconds: int = 60) -> bool:
@@ -106,11 +189,28 @@ def compare_datetimes(dt1: datetime, dt2: datetime, tolerance_seconds: int = 60)
     Returns:
         True if datetimes are within tolerance, False otherwise
     """
-    dt1_utc = normalize_to_utc(dt1)
-    dt2_utc = normalize_to_utc(dt2)
+    # Datetimes sharing one fixed-offset (or no) tzinfo subtract correctly as
+    # they are. A shared ZoneInfo does not qualify: same-tzinfo subtraction
+    # ignores offsets, which gives wall-clock time across a DST change.
+    tz = dt1.tzinfo
+    if tz is dt2.tzinfo and (tz is None or type(tz) is timezone):
+        delta = dt1 - dt2
+    else:
+        delta = normalize_to_utc(dt1) - normalize_to_utc(dt2)
     
-    time_diff = abs((dt1_utc - dt2_utc).total_seconds())
-    return time_diff < tolerance_seconds
+    # Compare as timedeltas: exact, and no float conversion per call
+    tolerance = _TOLERANCE_DELTAS.get(tolerance_seconds)
+    if tolerance is None:
+        tolerance = _TOLERANCE_DELTAS[tolerance_seconds] = timedelta(seconds=tolerance_seconds)
+    return abs(delta) < tolerance
+
+
+def _td_days(days: int) -> timedelta:
+    """Return a cached timedelta of the given number of days."""
+    td = _TD_DAYS.get(days)
+    if td is None:
+        td = _TD_DAYS[days] = timedelta(days=days)
+    return td
 
 
 def get_date_range(days_back: int = 0, days_forward: int = 30) -> tuple[datetime, datetime]:
@@ -124,13 +224,13 @@ def get_date_range(days_back: int = 0, days_forward: int = 30) -> tuple[datetime
     Returns:
         Tuple of (start_date, end_date) in UTC
     """
-    now = datetime.now(timezone.utc)
-    start_date = now - timedelta(days=days_back)
-    end_date = now + timedelta(days=days_forward)
+    now = _now_utc()
+    start_date = now - _td_days(days_back)
+    end_date = now + _td_days(days_forward)
     return (start_date, end_date)
 
 
-def normalize_to_pacific(dt: datetime) -> datetime:
+def _norm_pacific_zoneinfo(dt: datetime) -> datetime:
     """
     Normalize datetime to Pacific timezone (America/Los_Angeles).
     
@@ -146,31 +246,46 @@ def normalize_to_pacific(dt: datetime) -> datetime:
     
     Returns:
         Timezone-aware datetime in Pacific timezone (PST/PDT as appropriate)
+    """
+    tz = dt.tzinfo
+    # Already Pacific (e.g. normalized earlier in the sync)
+    if tz is _PACIFIC_TZ:
+        return dt
+    # If naive, assume it's already in Pacific timezone
+    if tz is None:
+        return dt.replace(tzinfo=_PACIFIC_TZ)
+    # Convert to Pacific timezone (handles DST correctly)
+    return dt.astimezone(_PACIFIC_TZ)
+
+
+def _norm_pacific_pytz(dt: datetime) -> datetime:
+    """Fallback to pytz if zoneinfo not available."""
+    # If naive, assume it's already in Pacific timezone
+    if dt.tzinfo is None:
+        return _PYTZ_PACIFIC.localize(dt)
+    # Convert to Pacific timezone
+    return dt.astimezone(_PYTZ_PACIFIC)
+
+
+def _norm_pacific_fixed(dt: datetime) -> datetime:
+    """
+    No timezone library available - use a fixed UTC-8 offset as last resort.
     
-    Raises:
-        RuntimeError: If neither zoneinfo nor pytz is available
+    Note: This does NOT handle DST correctly.
     """
-    if ZoneInfo:
-        pacific_tz = ZoneInfo('America/Los_Angeles')
-        # If naive, assume it's already in Pacific timezone
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=pacific_tz)
-        # Convert to Pacific timezone (handles DST correctly)
-        return dt.astimezone(pacific_tz)
-    elif _pytz:
-        # Fallback to pytz if zoneinfo not available
-        pacific_tz = _pytz.timezone('America/Los_Angeles')
-        # If naive, assume it's already in Pacific timezone
-        if dt.tzinfo is None:
-            return pacific_tz.localize(dt)
-        # Convert to Pacific timezone
-        return dt.astimezone(pacific_tz)
-    else:
-        # No timezone library available - return with fixed UTC-8 offset as last resort
-        # Note: This does NOT handle DST correctly
-        from datetime import timezone as tz
-        pst_offset = tz(timedelta(hours=-8))
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=pst_offset)
-        return dt.astimezone(pst_offset)
+    tz = dt.tzinfo
+    if tz is _FIXED_PST:
+        return dt
+    if tz is None:
+        return dt.replace(tzinfo=_FIXED_PST)
+    return dt.astimezone(_FIXED_PST)
+
 
+# The backend is fixed at import time, so pick the implementation once rather
+# than re-checking which zone resolved on every call
+if _PACIFIC_TZ is not None:
+    normalize_to_pacific = _norm_pacific_zoneinfo
+elif _pytz:
+    normalize_to_pacific = _norm_pacific_pytz
+else:
+    normalize_to_pacific = _norm_pacific_fixed